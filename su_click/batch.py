@@ -0,0 +1,409 @@
+# Added: Headless batch playback of presets with macro scripts, precompiled schedules and timing stats
+"""
+Headless batch playback for su_click presets.
+
+Presets are composed into a sequence of steps (repeat count, delay and
+speed factor per step), compiled once into a flat time-ordered schedule
+and replayed without the Tk window:
+
+    python batch.py "just paste" other_preset --repeat 3 --delay 0.5 --loops 10
+    python batch.py --script macro.json
+    python batch.py "just paste" --null --no-wait --loops 5000
+
+A macro script is a JSON file with a list of steps, or an object with
+"steps" and optional "loops" / "speed":
+
+    {
+        "loops": 10,
+        "steps": [
+            {"preset": "login", "repeat": 1},
+            {"delay": 2.0},
+            {"preset": "just paste", "repeat": 5, "speed": 2.0, "delay": 0.5}
+        ]
+    }
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from config import ConfigManager
+
+
+class MacroStep:
+    def __init__(self, preset=None, repeat=1, speed=1.0, delay=0.0):
+        self.preset = preset
+        self.repeat = repeat
+        self.speed = speed
+        self.delay = delay
+
+    @classmethod
+    def from_dict(cls, d):
+        """Build a step from a macro script entry."""
+        if not isinstance(d, dict):
+            raise ValueError(f"Invalid macro step: {d}")
+        try:
+            step = cls(
+                preset=d.get('preset'),
+                repeat=int(d.get('repeat', 1)),
+                speed=float(d.get('speed', 1.0)),
+                delay=float(d.get('delay', 0.0))
+            )
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid macro step values: {d}")
+        if step.preset is not None and not isinstance(step.preset, str):
+            raise ValueError(f"Macro step preset must be a name: {d}")
+        if step.repeat < 0 or step.speed <= 0 or step.delay < 0:
+            raise ValueError(f"Invalid macro step values: {d}")
+        if step.preset is None and step.delay == 0:
+            raise ValueError(f"Macro step needs a preset or a delay: {d}")
+        return step
+
+
+def load_macro_script(filename):
+    """Load a macro script. Returns (steps, loops, speed)."""
+    with open(filename, 'r') as f:
+        data = json.load(f)
+
+    if isinstance(data, list):
+        data = {'steps': data}
+    elif not isinstance(data, dict):
+        raise ValueError(f"Invalid macro script format in {filename}")
+
+    steps = [MacroStep.from_dict(d) for d in data.get('steps', [])]
+    try:
+        loops, speed = int(data.get('loops', 1)), float(data.get('speed', 1.0))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid loops or speed in {filename}")
+    if loops < 0 or speed <= 0:
+        raise ValueError(f"Invalid loops or speed in {filename}")
+    return steps, loops, speed
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_valid_event(d):
+    """Check the fields playback relies on before an event is compiled."""
+    if not isinstance(d, dict) or not _is_number(d.get('time', 0)):
+        return False
+    if d.get('type') == 'keyboard':
+        return isinstance(d.get('name', ''), str)
+    if d.get('type') == 'mouse':
+        return (isinstance(d.get('details', {}), dict) and
+                _is_number(d.get('x', 0)) and _is_number(d.get('y', 0)))
+    return True
+
+
+def compile_preset(filename, log_callback=print):
+    """Compile a preset file into a list of (offset, op, args) actions.
+
+    Offsets are relative to the first event of the preset at 1.0x speed.
+    The accepted formats match Recorder.load_events.
+    """
+    with open(filename, 'r') as f:
+        data = json.load(f)
+
+    if isinstance(data, list):
+        dict_events = data
+    elif isinstance(data, dict):
+        dict_events = data.get('events', [])
+    else:
+        raise ValueError(f"Invalid preset file format in {filename}")
+
+    actions = []
+    for d in dict_events:
+        if not _is_valid_event(d):
+            log_callback(f"DEBUG: Skipping invalid event data: {d}")
+            continue
+
+        event_type = d.get('type')
+        event_time = d.get('time', 0)
+
+        if event_type == 'keyboard':
+            key_event_type = d.get('event_type', 'down')
+            if key_event_type == 'down':
+                actions.append((event_time, 'press', (d.get('name', ''),)))
+            elif key_event_type == 'up':
+                actions.append((event_time, 'release', (d.get('name', ''),)))
+            else:
+                log_callback(f"DEBUG: Unknown keyboard event type: {key_event_type}")
+        elif event_type == 'mouse':
+            details = d.get('details', {})
+            x, y = d.get('x', 0), d.get('y', 0)
+            if d.get('event_type', 'ButtonEvent') == 'ButtonEvent':
+                actions.append((event_time, 'button', (x, y, details.get('button'), details.get('action'))))
+            elif d.get('event_type') == 'WheelEvent':
+                actions.append((event_time, 'wheel', (x, y, details.get('delta', 0))))
+            else:
+                log_callback(f"DEBUG: Unknown mouse event type: {d.get('event_type')}")
+        else:
+            log_callback(f"DEBUG: Unknown event type: {event_type}")
+
+    actions.sort(key=lambda a: a[0])
+    if actions:
+        start_offset = actions[0][0]
+        actions = [(t - start_offset, op, args) for t, op, args in actions]
+    return actions
+
+
+def compile_schedule(steps, resolve_preset, speed_factor=1.0, log_callback=print):
+    """Flatten macro steps into one time-ordered schedule.
+
+    Returns (schedule, duration) where schedule is a list of
+    (offset, op, args) and duration is the total length in seconds.
+    Each preset file is parsed only once no matter how often it is used.
+    """
+    compiled = {}
+    schedule = []
+    cursor = 0.0
+
+    for step in steps:
+        speed = step.speed * speed_factor
+        actions = []
+        length = 0.0
+        if step.preset is not None:
+            path = resolve_preset(step.preset)
+            if path not in compiled:
+                compiled[path] = compile_preset(path, log_callback)
+            actions = [(t / speed, op, args) for t, op, args in compiled[path]]
+            if actions:
+                length = actions[-1][0]
+
+        for _ in range(step.repeat):
+            schedule.extend((cursor + t, op, args) for t, op, args in actions)
+            cursor += length + step.delay
+
+    return schedule, cursor
+
+
+class NullBackend:
+    """Output backend that only counts actions. Works without mouse/keyboard."""
+
+    def __init__(self):
+        self.count = 0
+        self.stop_requested = False
+
+    def press(self, name):
+        self.count += 1
+
+    def release(self, name):
+        self.count += 1
+
+    def button(self, x, y, button, action):
+        self.count += 1
+
+    def wheel(self, x, y, delta):
+        self.count += 1
+
+    def start(self):
+        pass
+
+    def finish(self):
+        pass
+
+
+class LiveBackend:
+    """Output backend that sends real input, like Recorder playback."""
+
+    def __init__(self, config, log_callback=print):
+        # Imported here so the null backend runs where mouse/keyboard are unavailable
+        import keyboard
+        import mouse
+        from record import Recorder
+        self.keyboard = keyboard
+        self.mouse = mouse
+        self.config = config
+        self.log_callback = log_callback
+        self.recorder = Recorder(log_callback, {})
+        self.stop_requested = False
+        self.stop_hotkey = None
+
+    def request_stop(self):
+        self.stop_requested = True
+
+    def press(self, name):
+        self.keyboard.press(name)
+
+    def release(self, name):
+        self.keyboard.release(name)
+
+    def button(self, x, y, button, action):
+        self.recorder._set_cursor_pos(x, y)
+        time.sleep(0.025)
+        self.recorder._send_mouse_button(button, action)
+
+    def wheel(self, x, y, delta):
+        self.recorder._set_cursor_pos(x, y)
+        time.sleep(0.025)
+        self.mouse.wheel(delta)
+
+    def start(self):
+        """Register the global stop hotkey, same key as the GUI (Ctrl+F9 by default)."""
+        self.stop_requested = False
+        stop_key = self.config.load_hotkey_config()['stop_recording_and_playback']
+        self.stop_hotkey = self.keyboard.add_hotkey(f"ctrl+{stop_key}", self.request_stop)
+        self.log_callback(f"Press Ctrl+{stop_key.upper()} to stop playback.")
+        self.recorder._save_playback_cursor_position()
+
+    def finish(self):
+        if self.stop_hotkey is not None:
+            self.keyboard.remove_hotkey(self.stop_hotkey)
+            self.stop_hotkey = None
+        self.recorder.reset_all_keys()
+        self.recorder._restore_playback_cursor_position()
+
+
+class BatchPlayer:
+    def __init__(self, schedule, backend, duration=0.0, realtime=True):
+        self.backend = backend
+        self.duration = duration
+        self.realtime = realtime
+        # Bind backend methods once so the playback loop only dispatches
+        self.ops = [(t, getattr(backend, op), args) for t, op, args in schedule]
+        self.runs = []
+
+    def _wait_until(self, target):
+        """Sleep until perf_counter reaches target. Returns False if a stop was requested."""
+        backend = self.backend
+        while True:
+            if backend.stop_requested:
+                return False
+            remaining = target - time.perf_counter()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, 0.05))
+
+    def play_once(self):
+        """Play the schedule once and return stats for the run, or None if stopped."""
+        ops = self.ops
+        realtime = self.realtime
+        backend = self.backend
+        max_late = 0.0
+        start = time.perf_counter()
+
+        for offset, func, args in ops:
+            if backend.stop_requested:
+                return None
+            if realtime:
+                if not self._wait_until(start + offset):
+                    return None
+                late = time.perf_counter() - start - offset
+                if late > max_late:
+                    max_late = late
+            func(*args)
+
+        # Honour trailing delays so back-to-back loops keep their spacing
+        if realtime and not self._wait_until(start + self.duration):
+            return None
+
+        run = {'duration': time.perf_counter() - start, 'events': len(ops), 'max_late': max_late}
+        self.runs.append(run)
+        return run
+
+    def play(self, loops=1, log_callback=print):
+        """Play the schedule `loops` times. The stop hotkey or Ctrl+C stops after cleanup."""
+        self.backend.start()
+        try:
+            for i in range(loops):
+                run = self.play_once()
+                if run is None:
+                    log_callback("Playback stopped by user.")
+                    break
+                log_callback(f"Run {i + 1}/{loops}: {run['duration']:.3f}s, "
+                             f"{run['events']} events, max lag {run['max_late'] * 1000:.1f}ms")
+        except KeyboardInterrupt:
+            log_callback("Playback stopped by user.")
+        finally:
+            self.backend.finish()
+        return self.runs
+
+
+def summarize_runs(runs):
+    """Aggregate per-run stats into a summary dict."""
+    if not runs:
+        return {'runs': 0}
+    durations = [r['duration'] for r in runs]
+    total = sum(durations)
+    events = sum(r['events'] for r in runs)
+    return {
+        'runs': len(runs),
+        'events': events,
+        'total': total,
+        'min': min(durations),
+        'mean': total / len(runs),
+        'max': max(durations),
+        'max_late': max(r['max_late'] for r in runs),
+        'events_per_sec': events / total if total > 0 else 0.0
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play su_click presets without the GUI.")
+    parser.add_argument('presets', nargs='*', help="Preset names or paths, played in order")
+    parser.add_argument('--script', help="Macro script (JSON) describing the sequence")
+    parser.add_argument('--repeat', type=int, default=1, help="Repeat count for each preset")
+    parser.add_argument('--delay', type=float, default=0.0, help="Pause in seconds after each preset")
+    parser.add_argument('--speed', type=float, default=1.0, help="Playback speed factor")
+    parser.add_argument('--loops', type=int, default=None, help="Number of times to play the whole sequence")
+    parser.add_argument('--null', action='store_true', help="Use the null backend (no real input)")
+    parser.add_argument('--no-wait', action='store_true', help="Ignore timing and play as fast as possible")
+    parser.add_argument('--quiet', action='store_true', help="Only print the summary")
+    args = parser.parse_args(argv)
+
+    if args.speed <= 0 or args.repeat < 0 or args.delay < 0:
+        parser.error("Invalid --speed, --repeat or --delay value.")
+    if args.loops is not None and args.loops < 0:
+        parser.error("Invalid --loops value.")
+
+    config = ConfigManager()
+
+    def resolve_preset(name):
+        return name if os.path.isfile(name) else config.get_preset_path(name)
+
+    steps = [MacroStep(p, args.repeat, 1.0, args.delay) for p in args.presets]
+    loops, speed = 1, args.speed
+    if args.script:
+        try:
+            script_steps, loops, script_speed = load_macro_script(args.script)
+        except (OSError, ValueError) as e:
+            print(f"Error loading macro script {args.script}: {e}")
+            return 1
+        steps.extend(script_steps)
+        speed *= script_speed
+    if args.loops is not None:
+        loops = args.loops
+
+    if not steps:
+        parser.error("No presets or macro script given.")
+
+    log = (lambda message: None) if args.quiet else print
+    try:
+        schedule, duration = compile_schedule(steps, resolve_preset, speed, log)
+    except (OSError, ValueError) as e:
+        print(f"Error loading preset: {e}")
+        return 1
+
+    if not schedule:
+        print("No events to play.")
+        return 1
+
+    backend = NullBackend() if args.null else LiveBackend(config, log)
+    player = BatchPlayer(schedule, backend, duration, realtime=not args.no_wait)
+    log(f"Compiled {len(schedule)} events ({duration:.3f}s per loop), playing {loops} loop(s).")
+    runs = player.play(loops, log)
+
+    summary = summarize_runs(runs)
+    if summary['runs'] == 0:
+        print("No runs completed.")
+        return 1
+    print(f"{summary['runs']} run(s), {summary['events']} events in {summary['total']:.3f}s "
+          f"({summary['events_per_sec']:.0f} events/s)")
+    print(f"Run duration min/mean/max: {summary['min']:.3f}/{summary['mean']:.3f}/{summary['max']:.3f}s, "
+          f"max lag {summary['max_late'] * 1000:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-# Updated: Fixed JSON loading error when preset files contain mixed data types (strings and objects)
+# Updated: Moved mouse button playback into _send_mouse_button so batch.py can reuse it
 # Hotkey logic simplified to just trigger the app's functions.
 import mouse
 import keyboard
@@ -50,6 +50,37 @@ class Recorder:
         else:
             mouse.move(x, y, absolute=True)
 
+    def _send_mouse_button(self, button, action):
+        """Send a recorded mouse button action (down, up or double)."""
+        if WIN32_AVAILABLE:
+            down_flag, up_flag = None, None
+            if button == mouse.LEFT:
+                down_flag, up_flag = win32con.MOUSEEVENTF_LEFTDOWN, win32con.MOUSEEVENTF_LEFTUP
+            elif button == mouse.RIGHT:
+                down_flag, up_flag = win32con.MOUSEEVENTF_RIGHTDOWN, win32con.MOUSEEVENTF_RIGHTUP
+
+            if action == 'double':
+                if down_flag:
+                    win32api.mouse_event(down_flag, 0, 0, 0, 0)
+                    time.sleep(0.01)
+                    win32api.mouse_event(up_flag, 0, 0, 0, 0)
+                    time.sleep(0.05)
+                    win32api.mouse_event(down_flag, 0, 0, 0, 0)
+                    time.sleep(0.01)
+                    win32api.mouse_event(up_flag, 0, 0, 0, 0)
+            elif down_flag:
+                if action == mouse.DOWN:
+                    win32api.mouse_event(down_flag, 0, 0, 0, 0)
+                elif action == mouse.UP:
+                    win32api.mouse_event(up_flag, 0, 0, 0, 0)
+        else:
+            if action == 'double':
+                mouse.double_click(button)
+            elif action == mouse.DOWN:
+                mouse.press(button)
+            elif action == mouse.UP:
+                mouse.release(button)
+
     def _get_cursor_pos(self):
         """Get current cursor position."""
         try:
@@ -277,35 +308,7 @@ class Recorder:
                     time.sleep(0.025)
 
                     if event.event_type == 'ButtonEvent':
-                        button, action = event.details['button'], event.details['action']
-                        if WIN32_AVAILABLE:
-                            down_flag, up_flag = None, None
-                            if button == mouse.LEFT:
-                                down_flag, up_flag = win32con.MOUSEEVENTF_LEFTDOWN, win32con.MOUSEEVENTF_LEFTUP
-                            elif button == mouse.RIGHT:
-                                down_flag, up_flag = win32con.MOUSEEVENTF_RIGHTDOWN, win32con.MOUSEEVENTF_RIGHTUP
-
-                            if action == 'double':
-                                if down_flag:
-                                    win32api.mouse_event(down_flag, 0, 0, 0, 0)
-                                    time.sleep(0.01)
-                                    win32api.mouse_event(up_flag, 0, 0, 0, 0)
-                                    time.sleep(0.05)
-                                    win32api.mouse_event(down_flag, 0, 0, 0, 0)
-                                    time.sleep(0.01)
-                                    win32api.mouse_event(up_flag, 0, 0, 0, 0)
-                            elif down_flag:
-                                if action == mouse.DOWN:
-                                    win32api.mouse_event(down_flag, 0, 0, 0, 0)
-                                elif action == mouse.UP:
-                                    win32api.mouse_event(up_flag, 0, 0, 0, 0)
-                        else:
-                            if action == 'double':
-                                mouse.double_click(button)
-                            elif action == mouse.DOWN:
-                                mouse.press(button)
-                            elif action == mouse.UP:
-                                mouse.release(button)
+                        self._send_mouse_button(event.details['button'], event.details['action'])
                     elif event.event_type == 'WheelEvent':
                         mouse.wheel(event.details['delta'])
 